@@ -0,0 +1,12 @@
+count = 3
+name = "pyaot"
+ready = True
+done = False
+print("count:", count)
+print(1, "and", 2)
+print("name", name, "ready", ready)
+print(True, False, done)
+print("braces {} stay", count)
+print("{x}")
+print("small", count < 5)
+print(count == 3, count > 10)
@@ -0,0 +1,13 @@
+# Python escape sequences in string literals
+print("tab:\tend")
+print("line one\nline two")
+print("backslash: \\")
+print("quote: \"hi\"")
+print('single: \'hi\'')
+print("hex: \x41")
+print("unicode: \u00e9")
+print("octal: \101")
+# Invalid escapes like \d are kept literally by the compiler, but CPython 3.12+
+# warns on them, so the backslash is spelled out here
+print("escaped backslash: \\d stays")
+print("""triple "quoted" text""")
@@ -0,0 +1,19 @@
+# Variables assigned more than once become `var`, single assignments stay `const`
+count = 0
+while count < 5:
+    count = count + 1
+print(count)
+
+total = 0
+for i in range(4):
+    total = total + i
+print(total)
+
+# A name first bound in sibling branches is declared separately in each block
+flag = True
+if flag:
+    msg = "yes"
+    print(msg)
+else:
+    msg = "no"
+    print(msg)
@@ -123,6 +123,7 @@ pub const TypeInferrer = struct {
             .constant => |c| self.inferConstant(c.value),
             .name => |n| self.var_types.get(n.id) orelse .unknown,
             .binop => |b| try self.inferBinOp(b),
+            .compare => .bool,
             .call => |c| try self.inferCall(c),
             .list => .{ .list = &.unknown },
             .dict => .{ .dict = .{ .fields = std.ArrayList(DictType.Field){} } },
@@ -141,13 +142,13 @@ pub const TypeInferrer = struct {
     }
 
     fn inferBinOp(self: *TypeInferrer, binop: ast.Node.BinOp) InferError!NativeType {
-        const left_type = try self.inferExpr(binop.left.*);
-        const right_type = try self.inferExpr(binop.right.*);
-
         // Simplified type inference - just use left operand type
+        // The right subtree's type is unused, so it isn't inferred at all
         // TODO: Handle type promotion (int + float = float)
-        _ = right_type;
-        return left_type;
+        // Follow the left spine iteratively down to the leftmost operand
+        var cur = binop;
+        while (cur.left.* == .binop) cur = cur.left.binop;
+        return try self.inferExpr(cur.left.*);
     }
 
     fn inferCall(self: *TypeInferrer, call: ast.Node.Call) InferError!NativeType {
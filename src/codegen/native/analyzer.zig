@@ -11,100 +11,122 @@ pub const ModuleAnalysis = struct {
     needs_allocator: bool = false,
     needs_runtime: bool = false,
 
-    /// Merge two analyses
-    pub fn merge(self: *ModuleAnalysis, other: ModuleAnalysis) void {
-        self.needs_json = self.needs_json or other.needs_json;
-        self.needs_http = self.needs_http or other.needs_http;
-        self.needs_async = self.needs_async or other.needs_async;
-        self.needs_allocator = self.needs_allocator or other.needs_allocator;
-        self.needs_runtime = self.needs_runtime or other.needs_runtime;
+    /// Assignment state per variable (absent = never assigned)
+    var_state: std.StringHashMap(VarState),
+
+    pub fn init(allocator: std.mem.Allocator) ModuleAnalysis {
+        return .{
+            .var_state = std.StringHashMap(VarState).init(allocator),
+        };
+    }
+
+    pub fn deinit(self: *ModuleAnalysis) void {
+        self.var_state.deinit();
+    }
+
+    /// True if `name` is assigned more than once (must be emitted as `var`)
+    pub fn isReassigned(self: *const ModuleAnalysis, name: []const u8) bool {
+        const state = self.var_state.get(name) orelse return false;
+        return state == .reassigned;
+    }
+
+    /// Record an assignment to `name`, promoting it to reassigned on the second hit
+    /// Single hash probe: getOrPut covers both transitions
+    fn recordAssignment(self: *ModuleAnalysis, name: []const u8) !void {
+        const entry = try self.var_state.getOrPut(name);
+        entry.value_ptr.* = if (entry.found_existing) .reassigned else .declared;
     }
 };
 
+/// undeclared (not in map) -> declared -> reassigned
+pub const VarState = enum {
+    declared,
+    reassigned,
+};
+
+/// Requirements implied by calling into a native module
+const ModuleNeeds = struct {
+    json: bool = false,
+    http: bool = false,
+    async_: bool = false,
+    runtime: bool = false,
+};
+
+/// Module name -> requirements, one lookup instead of an eql ladder per call
+/// Every native module also needs the allocator
+const module_needs = std.StaticStringMap(ModuleNeeds).initComptime(.{
+    .{ "json", ModuleNeeds{ .json = true } },
+    .{ "http", ModuleNeeds{ .http = true, .runtime = true } },
+    .{ "asyncio", ModuleNeeds{ .async_ = true, .runtime = true } },
+});
+
 /// Analyze entire module to determine requirements
+/// Single pass: import/allocator needs and const/var tracking are collected together
 pub fn analyzeModule(module: ast.Node.Module, allocator: std.mem.Allocator) !ModuleAnalysis {
-    _ = allocator; // Will need for recursive analysis
-    var analysis = ModuleAnalysis{};
+    var analysis = ModuleAnalysis.init(allocator);
+    errdefer analysis.deinit();
 
     for (module.body) |stmt| {
-        const stmt_analysis = try analyzeStmt(stmt);
-        analysis.merge(stmt_analysis);
+        try analyzeStmt(&analysis, stmt);
     }
 
     return analysis;
 }
 
-fn analyzeStmt(node: ast.Node) !ModuleAnalysis {
-    var analysis = ModuleAnalysis{};
-
+fn analyzeStmt(analysis: *ModuleAnalysis, node: ast.Node) !void {
     switch (node) {
         .assign => |assign| {
-            const expr_analysis = try analyzeExpr(assign.value.*);
-            analysis.merge(expr_analysis);
+            for (assign.targets) |target| {
+                if (target == .name) {
+                    try analysis.recordAssignment(target.name.id);
+                }
+            }
+            analyzeExpr(analysis, assign.value.*);
         },
         .expr_stmt => |expr| {
-            const expr_analysis = try analyzeExpr(expr.value.*);
-            analysis.merge(expr_analysis);
+            analyzeExpr(analysis, expr.value.*);
         },
         .if_stmt => |if_stmt| {
-            const cond_analysis = try analyzeExpr(if_stmt.condition.*);
-            analysis.merge(cond_analysis);
+            analyzeExpr(analysis, if_stmt.condition.*);
 
             for (if_stmt.body) |stmt| {
-                const stmt_analysis = try analyzeStmt(stmt);
-                analysis.merge(stmt_analysis);
+                try analyzeStmt(analysis, stmt);
             }
 
             for (if_stmt.else_body) |stmt| {
-                const stmt_analysis = try analyzeStmt(stmt);
-                analysis.merge(stmt_analysis);
+                try analyzeStmt(analysis, stmt);
             }
         },
         .for_stmt => |for_stmt| {
-            const iter_analysis = try analyzeExpr(for_stmt.iter.*);
-            analysis.merge(iter_analysis);
+            analyzeExpr(analysis, for_stmt.iter.*);
 
             for (for_stmt.body) |stmt| {
-                const stmt_analysis = try analyzeStmt(stmt);
-                analysis.merge(stmt_analysis);
+                try analyzeStmt(analysis, stmt);
             }
         },
         .while_stmt => |while_stmt| {
-            const cond_analysis = try analyzeExpr(while_stmt.condition.*);
-            analysis.merge(cond_analysis);
+            analyzeExpr(analysis, while_stmt.condition.*);
 
             for (while_stmt.body) |stmt| {
-                const stmt_analysis = try analyzeStmt(stmt);
-                analysis.merge(stmt_analysis);
+                try analyzeStmt(analysis, stmt);
             }
         },
         else => {},
     }
-
-    return analysis;
 }
 
-fn analyzeExpr(node: ast.Node) !ModuleAnalysis {
-    var analysis = ModuleAnalysis{};
-
+fn analyzeExpr(analysis: *ModuleAnalysis, node: ast.Node) void {
     switch (node) {
         .call => |call| {
             // Check for module.function() calls
             if (call.func.* == .attribute) {
                 const attr = call.func.attribute;
                 if (attr.value.* == .name) {
-                    const module_name = attr.value.name.id;
-
-                    if (std.mem.eql(u8, module_name, "json")) {
-                        analysis.needs_json = true;
-                        analysis.needs_allocator = true;
-                    } else if (std.mem.eql(u8, module_name, "http")) {
-                        analysis.needs_http = true;
-                        analysis.needs_runtime = true;
-                        analysis.needs_allocator = true;
-                    } else if (std.mem.eql(u8, module_name, "asyncio")) {
-                        analysis.needs_async = true;
-                        analysis.needs_runtime = true;
+                    if (module_needs.get(attr.value.name.id)) |needs| {
+                        analysis.needs_json = analysis.needs_json or needs.json;
+                        analysis.needs_http = analysis.needs_http or needs.http;
+                        analysis.needs_async = analysis.needs_async or needs.async_;
+                        analysis.needs_runtime = analysis.needs_runtime or needs.runtime;
                         analysis.needs_allocator = true;
                     }
                 }
@@ -112,34 +134,26 @@ fn analyzeExpr(node: ast.Node) !ModuleAnalysis {
 
             // Analyze function arguments
             for (call.args) |arg| {
-                const arg_analysis = try analyzeExpr(arg);
-                analysis.merge(arg_analysis);
+                analyzeExpr(analysis, arg);
             }
         },
         .binop => |binop| {
-            const left_analysis = try analyzeExpr(binop.left.*);
-            const right_analysis = try analyzeExpr(binop.right.*);
-            analysis.merge(left_analysis);
-            analysis.merge(right_analysis);
+            analyzeExpr(analysis, binop.left.*);
+            analyzeExpr(analysis, binop.right.*);
         },
         .list => |list| {
             for (list.elts) |elt| {
-                const elt_analysis = try analyzeExpr(elt);
-                analysis.merge(elt_analysis);
+                analyzeExpr(analysis, elt);
             }
         },
         .dict => |dict| {
             for (dict.keys) |key| {
-                const key_analysis = try analyzeExpr(key);
-                analysis.merge(key_analysis);
+                analyzeExpr(analysis, key);
             }
             for (dict.values) |value| {
-                const value_analysis = try analyzeExpr(value);
-                analysis.merge(value_analysis);
+                analyzeExpr(analysis, value);
             }
         },
         else => {},
     }
-
-    return analysis;
 }
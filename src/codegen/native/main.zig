@@ -19,11 +19,80 @@ pub const CodegenError = error{
     OutOfMemory,
 } || native_types.InferError;
 
+/// True if any statement in `stmts`, or a block nested in one, assigns `name`
+fn assignsName(stmts: []const ast.Node, name: []const u8) bool {
+    for (stmts) |stmt| {
+        switch (stmt) {
+            .assign => |assign| {
+                for (assign.targets) |target| {
+                    if (target == .name and std.mem.eql(u8, target.name.id, name)) return true;
+                }
+            },
+            .if_stmt => |if_stmt| {
+                if (assignsName(if_stmt.body, name) or assignsName(if_stmt.else_body, name)) return true;
+            },
+            .while_stmt => |while_stmt| {
+                if (assignsName(while_stmt.body, name)) return true;
+            },
+            .for_stmt => |for_stmt| {
+                if (assignsName(for_stmt.body, name)) return true;
+            },
+            else => {},
+        }
+    }
+    return false;
+}
+
+/// Code generator for a call, given its arguments
+const CallHandler = *const fn (*NativeCodegen, []ast.Node) CodegenError!void;
+
+/// module.function() dispatch tables, resolved with one comptime-table lookup per level
+const json_funcs = std.StaticStringMap(CallHandler).initComptime(.{
+    .{ "loads", &json.genJsonLoads },
+    .{ "dumps", &json.genJsonDumps },
+});
+
+const http_funcs = std.StaticStringMap(CallHandler).initComptime(.{
+    .{ "get", &http.genHttpGet },
+    .{ "post", &http.genHttpPost },
+});
+
+const asyncio_funcs = std.StaticStringMap(CallHandler).initComptime(.{
+    .{ "run", &async_mod.genAsyncioRun },
+    .{ "gather", &async_mod.genAsyncioGather },
+    .{ "create_task", &async_mod.genAsyncioCreateTask },
+    .{ "sleep", &async_mod.genAsyncioSleep },
+});
+
+const module_funcs = std.StaticStringMap(std.StaticStringMap(CallHandler)).initComptime(.{
+    .{ "json", json_funcs },
+    .{ "http", http_funcs },
+    .{ "asyncio", asyncio_funcs },
+});
+
+/// Built-in function dispatch table (len, str, int, float)
+const builtin_funcs = std.StaticStringMap(CallHandler).initComptime(.{
+    .{ "len", &builtins.genLen },
+    .{ "str", &builtins.genStr },
+    .{ "int", &builtins.genInt },
+    .{ "float", &builtins.genFloat },
+});
+
 pub const NativeCodegen = struct {
     allocator: std.mem.Allocator,
     output: std.ArrayList(u8),
     type_inferrer: *TypeInferrer,
     indent_level: usize,
+    /// Set by generate - null until a module has been analyzed
+    analysis: ?analyzer.ModuleAnalysis,
+    /// Variables declared in the currently open Zig blocks (Zig locals are block-scoped)
+    declared_vars: std.StringHashMap(void),
+    /// Declaration order, so popScope can forget the names of a closed block
+    declared_stack: std.ArrayList([]const u8),
+    /// declared_stack length at the start of each open block
+    scope_marks: std.ArrayList(usize),
+    /// Statements following the one being generated, in the current block
+    block_rest: []const ast.Node,
 
     pub fn init(allocator: std.mem.Allocator, type_inferrer: *TypeInferrer) !*NativeCodegen {
         const self = try allocator.create(NativeCodegen);
@@ -32,19 +101,36 @@ pub const NativeCodegen = struct {
             .output = std.ArrayList(u8){},
             .type_inferrer = type_inferrer,
             .indent_level = 0,
+            .analysis = null,
+            .declared_vars = std.StringHashMap(void).init(allocator),
+            .declared_stack = std.ArrayList([]const u8){},
+            .scope_marks = std.ArrayList(usize){},
+            .block_rest = &.{},
         };
         return self;
     }
 
     pub fn deinit(self: *NativeCodegen) void {
         self.output.deinit(self.allocator);
+        if (self.analysis) |*analysis| analysis.deinit();
+        self.declared_vars.deinit();
+        self.declared_stack.deinit(self.allocator);
+        self.scope_marks.deinit(self.allocator);
         self.allocator.destroy(self);
     }
 
     /// Generate native Zig code for module
     pub fn generate(self: *NativeCodegen, module: ast.Node.Module) ![]const u8 {
         // PHASE 1: Analyze module to determine requirements
-        const analysis = try analyzer.analyzeModule(module, self.allocator);
+        // Analyze first so a failure leaves the previous analysis intact
+        const new_analysis = try analyzer.analyzeModule(module, self.allocator);
+        if (self.analysis) |*old| old.deinit();
+        self.analysis = new_analysis;
+        const analysis = &self.analysis.?;
+
+        // Reserve the output buffer once (imports/main prologue plus ~64 bytes
+        // per top-level statement) instead of regrowing it while emitting
+        try self.output.ensureTotalCapacity(self.allocator, 256 + module.body.len * 64);
 
         // PHASE 2: Generate imports based on analysis
         try self.emit("const std = @import(\"std\");\n");
@@ -69,9 +155,7 @@ pub const NativeCodegen = struct {
         }
 
         // PHASE 4: Generate statements
-        for (module.body) |stmt| {
-            try self.generateStmt(stmt);
-        }
+        try self.genStmts(module.body);
 
         self.dedent();
         try self.emit("}\n");
@@ -79,6 +163,34 @@ pub const NativeCodegen = struct {
         return self.output.toOwnedSlice(self.allocator);
     }
 
+    /// Generate a block's statements, tracking what follows each one
+    fn genStmts(self: *NativeCodegen, body: []const ast.Node) CodegenError!void {
+        const saved_rest = self.block_rest;
+        defer self.block_rest = saved_rest;
+
+        for (body, 0..) |stmt, i| {
+            self.block_rest = body[i + 1 ..];
+            try self.generateStmt(stmt);
+        }
+    }
+
+    /// Generate a nested block body (if/while/for) in its own declaration scope
+    fn genBlock(self: *NativeCodegen, body: []const ast.Node) CodegenError!void {
+        try self.scope_marks.append(self.allocator, self.declared_stack.items.len);
+        defer self.popScope();
+
+        try self.genStmts(body);
+    }
+
+    /// Forget variables declared in the block being closed
+    fn popScope(self: *NativeCodegen) void {
+        const mark = self.scope_marks.pop().?;
+        while (self.declared_stack.items.len > mark) {
+            const name = self.declared_stack.pop().?;
+            _ = self.declared_vars.remove(name);
+        }
+    }
+
     fn generateStmt(self: *NativeCodegen, node: ast.Node) CodegenError!void {
         switch (node) {
             .assign => |assign| try self.genAssign(assign),
@@ -98,17 +210,28 @@ pub const NativeCodegen = struct {
             if (target == .name) {
                 const var_name = target.name.id;
 
-                // Use const for all variables (simple approach - works for most Python code)
-                // TODO: Track mutations to determine const vs var
                 try self.emitIndent();
-                try self.output.appendSlice(self.allocator, "const ");
-                try self.output.appendSlice(self.allocator, var_name);
-
-                // Only emit type annotation for known types
-                // For unknown types (json.loads, etc.), let Zig infer
-                if (value_type != .unknown) {
-                    try self.output.appendSlice(self.allocator, ": ");
-                    try value_type.toZigType(self.allocator, &self.output);
+
+                const declared = try self.declared_vars.getOrPut(var_name);
+                if (declared.found_existing) {
+                    // Reassignment - variable is declared as var in an enclosing block
+                    try self.output.appendSlice(self.allocator, var_name);
+                } else {
+                    try self.declared_stack.append(self.allocator, var_name);
+
+                    // var only if assigned again later in this block or its nested blocks
+                    // The module-wide analysis rules out most names without scanning
+                    const mutable = self.analysis.?.isReassigned(var_name) and assignsName(self.block_rest, var_name);
+                    const keyword = if (mutable) "var " else "const ";
+                    try self.output.appendSlice(self.allocator, keyword);
+                    try self.output.appendSlice(self.allocator, var_name);
+
+                    // Only emit type annotation for known types
+                    // For unknown types (json.loads, etc.), let Zig infer
+                    if (value_type != .unknown) {
+                        try self.output.appendSlice(self.allocator, ": ");
+                        try value_type.toZigType(self.allocator, &self.output);
+                    }
                 }
 
                 try self.output.appendSlice(self.allocator, " = ");
@@ -145,17 +268,30 @@ pub const NativeCodegen = struct {
 
         try self.output.appendSlice(self.allocator, "std.debug.print(\"");
 
+        // Which runtime args are bools, so each is inferred once for both loops
+        var sfa = std.heap.stackFallback(32, self.allocator);
+        const scratch = sfa.get();
+        var is_bool = try std.ArrayList(bool).initCapacity(scratch, args.len);
+        defer is_bool.deinit(scratch);
+
         // Generate format string
+        // Constants are specialized into the format text at compile time,
+        // only runtime values go through std.fmt
         for (args, 0..) |arg, i| {
-            const arg_type = try self.type_inferrer.inferExpr(arg);
-            const fmt = switch (arg_type) {
-                .int => "{d}",
-                .float => "{d}",
-                .bool => "{}",
-                .string => "{s}",
-                else => "{any}",
-            };
-            try self.output.appendSlice(self.allocator, fmt);
+            if (isFoldableConstant(arg)) {
+                try self.genFormatConstant(arg.constant);
+            } else {
+                const arg_type = try self.type_inferrer.inferExpr(arg);
+                is_bool.appendAssumeCapacity(arg_type == .bool);
+                const fmt = switch (arg_type) {
+                    .int => "{d}",
+                    .float => "{d}",
+                    .bool => "{s}",
+                    .string => "{s}",
+                    else => "{any}",
+                };
+                try self.output.appendSlice(self.allocator, fmt);
+            }
 
             if (i < args.len - 1) {
                 try self.output.appendSlice(self.allocator, " ");
@@ -164,17 +300,41 @@ pub const NativeCodegen = struct {
 
         try self.output.appendSlice(self.allocator, "\\n\", .{");
 
-        // Generate arguments
-        for (args, 0..) |arg, i| {
-            try self.genExpr(arg);
-            if (i < args.len - 1) {
-                try self.output.appendSlice(self.allocator, ", ");
+        // Generate arguments (folded constants are already in the format string)
+        var runtime_idx: usize = 0;
+        for (args) |arg| {
+            if (isFoldableConstant(arg)) continue;
+            if (runtime_idx > 0) try self.output.appendSlice(self.allocator, ", ");
+            // Python prints bools as True/False, Zig's {} would give true/false
+            if (is_bool.items[runtime_idx]) {
+                try self.output.appendSlice(self.allocator, "(if (");
+                try self.genExpr(arg);
+                try self.output.appendSlice(self.allocator, ") \"True\" else \"False\")");
+            } else {
+                try self.genExpr(arg);
             }
+            runtime_idx += 1;
         }
 
         try self.output.appendSlice(self.allocator, "});\n");
     }
 
+    /// Constants whose Python str() is known at compile time
+    /// Floats are excluded - Zig's {d} drops the ".0" Python prints
+    fn isFoldableConstant(node: ast.Node) bool {
+        return node == .constant and node.constant.value != .float;
+    }
+
+    /// Write a constant as literal text inside a format string
+    fn genFormatConstant(self: *NativeCodegen, constant: ast.Node.Constant) CodegenError!void {
+        switch (constant.value) {
+            .int => |v| try self.output.writer(self.allocator).print("{d}", .{v}),
+            .bool => |v| try self.output.appendSlice(self.allocator, if (v) "True" else "False"),
+            .string => |s| try self.genStringContent(s, true),
+            .float => unreachable,
+        }
+    }
+
     fn genIf(self: *NativeCodegen, if_stmt: ast.Node.If) CodegenError!void {
         try self.emitIndent();
         try self.output.appendSlice(self.allocator, "if (");
@@ -182,9 +342,7 @@ pub const NativeCodegen = struct {
         try self.output.appendSlice(self.allocator, ") {\n");
 
         self.indent();
-        for (if_stmt.body) |stmt| {
-            try self.generateStmt(stmt);
-        }
+        try self.genBlock(if_stmt.body);
         self.dedent();
 
         try self.emitIndent();
@@ -193,9 +351,7 @@ pub const NativeCodegen = struct {
         if (if_stmt.else_body.len > 0) {
             try self.output.appendSlice(self.allocator, " else {\n");
             self.indent();
-            for (if_stmt.else_body) |stmt| {
-                try self.generateStmt(stmt);
-            }
+            try self.genBlock(if_stmt.else_body);
             self.dedent();
             try self.emitIndent();
             try self.output.appendSlice(self.allocator, "}");
@@ -211,9 +367,7 @@ pub const NativeCodegen = struct {
         try self.output.appendSlice(self.allocator, ") {\n");
 
         self.indent();
-        for (while_stmt.body) |stmt| {
-            try self.generateStmt(stmt);
-        }
+        try self.genBlock(while_stmt.body);
         self.dedent();
 
         try self.emitIndent();
@@ -237,12 +391,12 @@ pub const NativeCodegen = struct {
         // Generic iteration
         try self.output.appendSlice(self.allocator, "for (");
         try self.genExpr(for_stmt.iter.*);
-        try self.output.writer(self.allocator).print(") |{s}| {{\n", .{target_name});
+        try self.output.appendSlice(self.allocator, ") |");
+        try self.output.appendSlice(self.allocator, target_name);
+        try self.output.appendSlice(self.allocator, "| {\n");
 
         self.indent();
-        for (for_stmt.body) |stmt| {
-            try self.generateStmt(stmt);
-        }
+        try self.genBlock(for_stmt.body);
         self.dedent();
 
         try self.emitIndent();
@@ -251,7 +405,9 @@ pub const NativeCodegen = struct {
 
     fn genRangeLoop(self: *NativeCodegen, var_name: []const u8, args: []ast.Node, body: []ast.Node) CodegenError!void {
         // range(n) or range(start, end) or range(start, end, step)
-        try self.output.writer(self.allocator).print("var {s}: i64 = ", .{var_name});
+        try self.output.appendSlice(self.allocator, "var ");
+        try self.output.appendSlice(self.allocator, var_name);
+        try self.output.appendSlice(self.allocator, ": i64 = ");
 
         if (args.len == 1) {
             try self.output.appendSlice(self.allocator, "0");
@@ -259,7 +415,9 @@ pub const NativeCodegen = struct {
             try self.genExpr(args[0]);
         }
 
-        try self.output.writer(self.allocator).print(";\nwhile ({s} < ", .{var_name});
+        try self.output.appendSlice(self.allocator, ";\nwhile (");
+        try self.output.appendSlice(self.allocator, var_name);
+        try self.output.appendSlice(self.allocator, " < ");
 
         if (args.len == 1) {
             try self.genExpr(args[0]);
@@ -267,16 +425,15 @@ pub const NativeCodegen = struct {
             try self.genExpr(args[1]);
         }
 
-        try self.output.writer(self.allocator).print(") {{\n", .{});
+        try self.output.appendSlice(self.allocator, ") {\n");
 
         self.indent();
-        for (body) |stmt| {
-            try self.generateStmt(stmt);
-        }
+        try self.genBlock(body);
 
         // Increment
         try self.emitIndent();
-        try self.output.writer(self.allocator).print("{s} += ", .{var_name});
+        try self.output.appendSlice(self.allocator, var_name);
+        try self.output.appendSlice(self.allocator, " += ");
         if (args.len == 3) {
             try self.genExpr(args[2]);
         } else {
@@ -310,31 +467,150 @@ pub const NativeCodegen = struct {
             .float => try self.output.writer(self.allocator).print("{d}", .{constant.value.float}),
             .bool => try self.output.appendSlice(self.allocator, if (constant.value.bool) "true" else "false"),
             .string => |s| {
-                // Strip Python quotes
-                const content = if (s.len >= 2) s[1..s.len-1] else s;
-
-                // Escape quotes and backslashes for Zig string literal
+                // Emitted inline as a []const u8 literal - no allocation at runtime,
+                // and Zig already pools identical literals in rodata, so repeated
+                // strings need no hoisting into shared consts
                 try self.output.appendSlice(self.allocator, "\"");
-                for (content) |c| {
-                    switch (c) {
-                        '"' => try self.output.appendSlice(self.allocator, "\\\""),
-                        '\\' => try self.output.appendSlice(self.allocator, "\\\\"),
-                        '\n' => try self.output.appendSlice(self.allocator, "\\n"),
-                        '\r' => try self.output.appendSlice(self.allocator, "\\r"),
-                        '\t' => try self.output.appendSlice(self.allocator, "\\t"),
-                        else => try self.output.writer(self.allocator).print("{c}", .{c}),
-                    }
-                }
+                try self.genStringContent(s, false);
                 try self.output.appendSlice(self.allocator, "\"");
             },
         }
     }
 
+    /// Emit the body of a Python string literal as Zig string literal content
+    /// Python escapes are decoded and each resulting byte re-escaped for Zig,
+    /// so quotes, backslashes and control characters survive the round trip
+    /// in_format: also double braces so the text is literal inside a std.fmt format string
+    fn genStringContent(self: *NativeCodegen, s: []const u8, comptime in_format: bool) CodegenError!void {
+        // Strip Python quotes (single or triple)
+        const is_triple = s.len >= 6 and (std.mem.startsWith(u8, s, "\"\"\"") or std.mem.startsWith(u8, s, "'''"));
+        const quote_len: usize = if (is_triple) 3 else 1;
+        const content = if (s.len >= 2 * quote_len) s[quote_len .. s.len - quote_len] else s;
+
+        var i: usize = 0;
+        while (i < content.len) : (i += 1) {
+            const c = content[i];
+            if (c != '\\' or i + 1 == content.len) {
+                try self.genStringByte(c, in_format);
+                continue;
+            }
+
+            i += 1;
+            const esc = content[i];
+            switch (esc) {
+                'n' => try self.genStringByte('\n', in_format),
+                'r' => try self.genStringByte('\r', in_format),
+                't' => try self.genStringByte('\t', in_format),
+                'a' => try self.genStringByte(0x07, in_format),
+                'b' => try self.genStringByte(0x08, in_format),
+                'f' => try self.genStringByte(0x0c, in_format),
+                'v' => try self.genStringByte(0x0b, in_format),
+                '\\', '\'', '"' => try self.genStringByte(esc, in_format),
+                '\n' => {}, // Line continuation
+                'x', 'u', 'U', '0'...'7' => {
+                    // Octal takes 1-3 digits starting at the escape char, hex forms an exact count after it
+                    const is_octal = esc != 'x' and esc != 'u' and esc != 'U';
+                    const start = if (is_octal) i else i + 1;
+                    const max_digits: usize = switch (esc) {
+                        'x' => 2,
+                        'u' => 4,
+                        'U' => 8,
+                        else => 3,
+                    };
+                    const min_digits: usize = if (is_octal) 1 else max_digits;
+                    const base: u8 = if (is_octal) 8 else 16;
+
+                    if (try self.genNumericEscape(content, start, min_digits, max_digits, base, in_format)) |last| {
+                        i = last;
+                    } else {
+                        try self.genStringByte('\\', in_format);
+                        try self.genStringByte(esc, in_format);
+                    }
+                },
+                else => {
+                    // Unknown escape - Python keeps the backslash
+                    // \N{name} also lands here: unsupported (needs the Unicode name table),
+                    // so it is kept literally instead of decoded
+                    try self.genStringByte('\\', in_format);
+                    try self.genStringByte(esc, in_format);
+                },
+            }
+        }
+    }
+
+    /// Decode a numeric escape (octal, \x, \u, \U) starting at `start` and emit it as UTF-8
+    /// Returns the index of the last digit consumed, or null if the escape is malformed
+    fn genNumericEscape(self: *NativeCodegen, content: []const u8, start: usize, min_digits: usize, max_digits: usize, base: u8, comptime in_format: bool) CodegenError!?usize {
+        var end = start;
+        while (end < content.len and end - start < max_digits) : (end += 1) {
+            _ = std.fmt.charToDigit(content[end], base) catch break;
+        }
+        if (end - start < min_digits) return null;
+
+        const codepoint = std.fmt.parseInt(u21, content[start..end], base) catch return null;
+        var buf: [4]u8 = undefined;
+        const len = std.unicode.utf8Encode(codepoint, &buf) catch return null;
+        for (buf[0..len]) |b| {
+            try self.genStringByte(b, in_format);
+        }
+        return end - 1;
+    }
+
+    /// Emit one byte of string content, escaped for a Zig string literal
+    fn genStringByte(self: *NativeCodegen, c: u8, comptime in_format: bool) CodegenError!void {
+        switch (c) {
+            '"' => try self.output.appendSlice(self.allocator, "\\\""),
+            '\\' => try self.output.appendSlice(self.allocator, "\\\\"),
+            '\n' => try self.output.appendSlice(self.allocator, "\\n"),
+            '\r' => try self.output.appendSlice(self.allocator, "\\r"),
+            '\t' => try self.output.appendSlice(self.allocator, "\\t"),
+            '{', '}' => {
+                if (in_format) try self.output.append(self.allocator, c);
+                try self.output.append(self.allocator, c);
+            },
+            0x00...0x08, 0x0b, 0x0c, 0x0e...0x1f, 0x7f => {
+                const hex = "0123456789abcdef";
+                try self.output.appendSlice(self.allocator, "\\x");
+                try self.output.append(self.allocator, hex[c >> 4]);
+                try self.output.append(self.allocator, hex[c & 0x0f]);
+            },
+            else => try self.output.append(self.allocator, c),
+        }
+    }
+
     fn genBinOp(self: *NativeCodegen, binop: ast.Node.BinOp) CodegenError!void {
-        try self.output.appendSlice(self.allocator, "(");
-        try self.genExpr(binop.left.*);
+        // Walk the left spine iteratively - `a + b + c + d` nests to the left,
+        // so only right operands recurse through genExpr
+        // Typical chains fit on the stack; only very long ones touch the allocator
+        var sfa = std.heap.stackFallback(16 * @sizeOf(ast.Node.BinOp), self.allocator);
+        const scratch = sfa.get();
+        var spine = std.ArrayList(ast.Node.BinOp){};
+        defer spine.deinit(scratch);
+
+        var cur = binop;
+        while (true) {
+            try spine.append(scratch, cur);
+            if (cur.left.* != .binop) break;
+            cur = cur.left.binop;
+        }
 
-        const op_str = switch (binop.op) {
+        // Same text as the recursive form: ((a + b) + c)
+        try self.output.appendNTimes(self.allocator, '(', spine.items.len);
+        try self.genExpr(cur.left.*);
+
+        // Innermost operation first
+        var i = spine.items.len;
+        while (i > 0) {
+            i -= 1;
+            const link = spine.items[i];
+            try self.output.appendSlice(self.allocator, binOpStr(link.op));
+            try self.genExpr(link.right.*);
+            try self.output.appendSlice(self.allocator, ")");
+        }
+    }
+
+    fn binOpStr(op: ast.Operator) []const u8 {
+        return switch (op) {
             .Add => " + ",
             .Sub => " - ",
             .Mult => " * ",
@@ -343,10 +619,6 @@ pub const NativeCodegen = struct {
             .FloorDiv => " / ",  // Zig doesn't distinguish
             else => " ? ",
         };
-        try self.output.appendSlice(self.allocator, op_str);
-
-        try self.genExpr(binop.right.*);
-        try self.output.appendSlice(self.allocator, ")");
     }
 
     fn genUnaryOp(self: *NativeCodegen, unaryop: ast.Node.UnaryOp) CodegenError!void {
@@ -391,55 +663,11 @@ pub const NativeCodegen = struct {
         if (call.func.* == .attribute) {
             const attr = call.func.attribute;
             if (attr.value.* == .name) {
-                const module_name = attr.value.name.id;
-                const func_name = attr.attr;
-
-                // Handle json.loads()
-                if (std.mem.eql(u8, module_name, "json") and std.mem.eql(u8, func_name, "loads")) {
-                    try json.genJsonLoads(self, call.args);
-                    return;
-                }
-
-                // Handle json.dumps()
-                if (std.mem.eql(u8, module_name, "json") and std.mem.eql(u8, func_name, "dumps")) {
-                    try json.genJsonDumps(self, call.args);
-                    return;
-                }
-
-                // Handle http.get()
-                if (std.mem.eql(u8, module_name, "http") and std.mem.eql(u8, func_name, "get")) {
-                    try http.genHttpGet(self, call.args);
-                    return;
-                }
-
-                // Handle http.post()
-                if (std.mem.eql(u8, module_name, "http") and std.mem.eql(u8, func_name, "post")) {
-                    try http.genHttpPost(self, call.args);
-                    return;
-                }
-
-                // Handle asyncio.run()
-                if (std.mem.eql(u8, module_name, "asyncio") and std.mem.eql(u8, func_name, "run")) {
-                    try async_mod.genAsyncioRun(self, call.args);
-                    return;
-                }
-
-                // Handle asyncio.gather()
-                if (std.mem.eql(u8, module_name, "asyncio") and std.mem.eql(u8, func_name, "gather")) {
-                    try async_mod.genAsyncioGather(self, call.args);
-                    return;
-                }
-
-                // Handle asyncio.create_task()
-                if (std.mem.eql(u8, module_name, "asyncio") and std.mem.eql(u8, func_name, "create_task")) {
-                    try async_mod.genAsyncioCreateTask(self, call.args);
-                    return;
-                }
-
-                // Handle asyncio.sleep()
-                if (std.mem.eql(u8, module_name, "asyncio") and std.mem.eql(u8, func_name, "sleep")) {
-                    try async_mod.genAsyncioSleep(self, call.args);
-                    return;
+                if (module_funcs.get(attr.value.name.id)) |funcs| {
+                    if (funcs.get(attr.attr)) |handler| {
+                        try handler(self, call.args);
+                        return;
+                    }
                 }
             }
         }
@@ -448,27 +676,8 @@ pub const NativeCodegen = struct {
         if (call.func.* == .name) {
             const func_name = call.func.name.id;
 
-            // Handle len()
-            if (std.mem.eql(u8, func_name, "len")) {
-                try builtins.genLen(self, call.args);
-                return;
-            }
-
-            // Handle str()
-            if (std.mem.eql(u8, func_name, "str")) {
-                try builtins.genStr(self, call.args);
-                return;
-            }
-
-            // Handle int()
-            if (std.mem.eql(u8, func_name, "int")) {
-                try builtins.genInt(self, call.args);
-                return;
-            }
-
-            // Handle float()
-            if (std.mem.eql(u8, func_name, "float")) {
-                try builtins.genFloat(self, call.args);
+            if (builtin_funcs.get(func_name)) |handler| {
+                try handler(self, call.args);
                 return;
             }
 
@@ -524,10 +733,8 @@ pub const NativeCodegen = struct {
     }
 
     fn emitIndent(self: *NativeCodegen) CodegenError!void {
-        var i: usize = 0;
-        while (i < self.indent_level) : (i += 1) {
-            try self.output.appendSlice(self.allocator, "    ");
-        }
+        // One reserve + fill instead of an append per indent level
+        try self.output.appendNTimes(self.allocator, ' ', self.indent_level * 4);
     }
 
     fn indent(self: *NativeCodegen) void {
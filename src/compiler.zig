@@ -3,30 +3,11 @@ const std = @import("std");
 /// Compile Zig source code to native binary
 pub fn compileZig(allocator: std.mem.Allocator, zig_code: []const u8, output_path: []const u8) !void {
     // Copy runtime files to /tmp for import
-    const runtime_files = [_][]const u8{ "runtime.zig", "pystring.zig", "pylist.zig", "dict.zig", "pyint.zig", "pytuple.zig", "async.zig", "http.zig", "json.zig" };
-    for (runtime_files) |file| {
-        const src_path = try std.fmt.allocPrint(allocator, "packages/runtime/src/{s}", .{file});
-        defer allocator.free(src_path);
-        const dst_path = try std.fmt.allocPrint(allocator, "/tmp/{s}", .{file});
-        defer allocator.free(dst_path);
-
-        const src = std.fs.cwd().openFile(src_path, .{}) catch continue;
-        defer src.close();
-        const dst = try std.fs.createFileAbsolute(dst_path, .{});
-        defer dst.close();
-
-        const content = try src.readToEndAlloc(allocator, 1024 * 1024);
-        defer allocator.free(content);
-        try dst.writeAll(content);
-    }
-
-    // Copy runtime subdirectories to /tmp
-    try copyRuntimeDir(allocator, "http");
-    try copyRuntimeDir(allocator, "async");
-    try copyRuntimeDir(allocator, "json");
+    try copyRuntime(allocator);
 
     // Write Zig code to temporary file
-    const tmp_path = try std.fmt.allocPrint(allocator, "/tmp/pyaot_main_{d}.zig", .{std.time.milliTimestamp()});
+    // Thread id keeps concurrent directory builds from sharing a temp file
+    const tmp_path = try std.fmt.allocPrint(allocator, "/tmp/pyaot_main_{d}_{d}.zig", .{ std.time.milliTimestamp(), std.Thread.getCurrentId() });
     defer allocator.free(tmp_path);
 
     // Write temp file
@@ -78,47 +59,17 @@ pub fn compileZig(allocator: std.mem.Allocator, zig_code: []const u8, output_pat
     const argv = try args.toOwnedSlice(allocator);
     defer allocator.free(argv);
 
-    const result = try std.process.Child.run(.{
-        .allocator = allocator,
-        .argv = argv,
-    });
-    // Child.run always allocates stdout/stderr, must free them
-    defer allocator.free(result.stdout);
-    defer allocator.free(result.stderr);
-
-    if (result.term.Exited != 0) {
-        std.debug.print("Zig compilation failed:\n{s}\n", .{result.stderr});
-        return error.ZigCompilationFailed;
-    }
+    try runZig(allocator, argv, output_path);
 }
 
 /// Compile Zig source code to shared library (.so/.dylib)
 pub fn compileZigSharedLib(allocator: std.mem.Allocator, zig_code: []const u8, output_path: []const u8) !void {
     // Copy runtime files to /tmp for import
-    const runtime_files = [_][]const u8{ "runtime.zig", "pystring.zig", "pylist.zig", "dict.zig", "pyint.zig", "pytuple.zig", "async.zig", "http.zig", "json.zig" };
-    for (runtime_files) |file| {
-        const src_path = try std.fmt.allocPrint(allocator, "packages/runtime/src/{s}", .{file});
-        defer allocator.free(src_path);
-        const dst_path = try std.fmt.allocPrint(allocator, "/tmp/{s}", .{file});
-        defer allocator.free(dst_path);
-
-        const src = std.fs.cwd().openFile(src_path, .{}) catch continue;
-        defer src.close();
-        const dst = try std.fs.createFileAbsolute(dst_path, .{});
-        defer dst.close();
-
-        const content = try src.readToEndAlloc(allocator, 1024 * 1024);
-        defer allocator.free(content);
-        try dst.writeAll(content);
-    }
-
-    // Copy runtime subdirectories to /tmp
-    try copyRuntimeDir(allocator, "http");
-    try copyRuntimeDir(allocator, "async");
-    try copyRuntimeDir(allocator, "json");
+    try copyRuntime(allocator);
 
     // Write Zig code to temporary file
-    const tmp_path = try std.fmt.allocPrint(allocator, "/tmp/pyaot_main_{d}.zig", .{std.time.milliTimestamp()});
+    // Thread id keeps concurrent directory builds from sharing a temp file
+    const tmp_path = try std.fmt.allocPrint(allocator, "/tmp/pyaot_main_{d}_{d}.zig", .{ std.time.milliTimestamp(), std.Thread.getCurrentId() });
     defer allocator.free(tmp_path);
 
     // Write temp file
@@ -166,16 +117,29 @@ pub fn compileZigSharedLib(allocator: std.mem.Allocator, zig_code: []const u8, o
     const argv = try args.toOwnedSlice(allocator);
     defer allocator.free(argv);
 
-    const result = try std.process.Child.run(.{
-        .allocator = allocator,
-        .argv = argv,
-    });
-    // Child.run always allocates stdout/stderr, must free them
-    defer allocator.free(result.stdout);
-    defer allocator.free(result.stderr);
+    try runZig(allocator, argv, output_path);
+}
 
-    if (result.term.Exited != 0) {
-        std.debug.print("Zig compilation failed:\n{s}\n", .{result.stderr});
+/// Run zig with stdout discarded - only stderr is kept, for the failure message
+/// The message names `output_path` and is printed in one call, so it stays
+/// attributable when several files compile concurrently
+fn runZig(allocator: std.mem.Allocator, argv: []const []const u8, output_path: []const u8) !void {
+    var child = std.process.Child.init(argv, allocator);
+    child.stdin_behavior = .Ignore;
+    child.stdout_behavior = .Ignore;
+    child.stderr_behavior = .Pipe;
+
+    try child.spawn();
+    // Reap the child if draining stderr fails so it isn't left as a zombie
+    errdefer if (child.kill()) |_| {} else |_| {};
+
+    // Drain stderr before waiting so a noisy build can't block on a full pipe
+    const stderr = try child.stderr.?.readToEndAlloc(allocator, 10 * 1024 * 1024);
+    defer allocator.free(stderr);
+
+    const term = try child.wait();
+    if (term != .Exited or term.Exited != 0) {
+        std.debug.print("Zig compilation failed for {s}:\n{s}\n", .{ output_path, stderr });
         return error.ZigCompilationFailed;
     }
 }
@@ -201,6 +165,41 @@ fn findZigBinary(allocator: std.mem.Allocator) ![]const u8 {
     return try allocator.dupe(u8, "zig");
 }
 
+/// Set once the runtime has been staged in /tmp by this process
+var runtime_staged: bool = false;
+/// Guards staging when `pyaot build dir/` compiles files on several threads
+var runtime_mutex: std.Thread.Mutex = .{};
+
+/// Copy runtime sources and subdirectories to /tmp so @import("runtime") resolves
+/// Runs once per process - later compiles (e.g. `pyaot build dir/`) reuse the staged copy
+fn copyRuntime(allocator: std.mem.Allocator) !void {
+    runtime_mutex.lock();
+    defer runtime_mutex.unlock();
+
+    if (runtime_staged) return;
+
+    const runtime_files = [_][]const u8{ "runtime.zig", "pystring.zig", "pylist.zig", "dict.zig", "pyint.zig", "pytuple.zig", "async.zig", "http.zig", "json.zig" };
+    for (runtime_files) |file| {
+        const src_path = try std.fmt.allocPrint(allocator, "packages/runtime/src/{s}", .{file});
+        defer allocator.free(src_path);
+        const dst_path = try std.fmt.allocPrint(allocator, "/tmp/{s}", .{file});
+        defer allocator.free(dst_path);
+
+        // copyFile streams in the kernel where possible - no heap copy of the source
+        std.fs.cwd().copyFile(src_path, std.fs.cwd(), dst_path, .{}) catch |err| switch (err) {
+            error.FileNotFound => continue,
+            else => return err,
+        };
+    }
+
+    // Copy runtime subdirectories to /tmp
+    try copyRuntimeDir(allocator, "http");
+    try copyRuntimeDir(allocator, "async");
+    try copyRuntimeDir(allocator, "json");
+
+    runtime_staged = true;
+}
+
 /// Copy a runtime subdirectory recursively to /tmp
 fn copyRuntimeDir(allocator: std.mem.Allocator, dir_name: []const u8) !void {
     const src_dir_path = try std.fmt.allocPrint(allocator, "packages/runtime/src/{s}", .{dir_name});
@@ -231,14 +230,7 @@ fn copyRuntimeDir(allocator: std.mem.Allocator, dir_name: []const u8) !void {
             const dst_file_path = try std.fmt.allocPrint(allocator, "{s}/{s}", .{ dst_dir_path, entry.name });
             defer allocator.free(dst_file_path);
 
-            const src_file = try std.fs.cwd().openFile(src_file_path, .{});
-            defer src_file.close();
-            const dst_file = try std.fs.createFileAbsolute(dst_file_path, .{});
-            defer dst_file.close();
-
-            const content = try src_file.readToEndAlloc(allocator, 10 * 1024 * 1024);
-            defer allocator.free(content);
-            try dst_file.writeAll(content);
+            try std.fs.cwd().copyFile(src_file_path, std.fs.cwd(), dst_file_path, .{});
         } else if (entry.kind == .directory) {
             // Recursively copy subdirectory
             const subdir_name = try std.fmt.allocPrint(allocator, "{s}/{s}", .{ dir_name, entry.name });
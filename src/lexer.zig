@@ -78,18 +78,20 @@ pub const TokenType = enum {
     Eof,
 };
 
+/// One record per token, so keep it compact: line/column fit in u32
+/// (sources are capped at 10MB), making a Token 32 bytes instead of 40
 pub const Token = struct {
     type: TokenType,
     lexeme: []const u8,
-    line: usize,
-    column: usize,
+    line: u32,
+    column: u32,
 };
 
 pub const Lexer = struct {
     source: []const u8,
     current: usize,
-    line: usize,
-    column: usize,
+    line: u32,
+    column: u32,
     indent_stack: std.ArrayList(usize),
     allocator: std.mem.Allocator,
 
@@ -115,6 +117,10 @@ pub const Lexer = struct {
         var tokens = std.ArrayList(Token){};
         errdefer tokens.deinit(self.allocator);
 
+        // Reserve up front from source size (roughly one token per 4 bytes of
+        // Python) so the token buffer isn't regrown and copied while lexing
+        try tokens.ensureTotalCapacity(self.allocator, self.source.len / 4 + 1);
+
         var paren_depth: usize = 0; // Track parentheses for newline handling
         var at_line_start = true;
 
@@ -270,7 +276,7 @@ pub const Lexer = struct {
         return 0;
     }
 
-    fn tokenizeIdentifier(self: *Lexer, start: usize, start_column: usize) !Token {
+    fn tokenizeIdentifier(self: *Lexer, start: usize, start_column: u32) !Token {
         while (self.peek()) |c| {
             if (self.isAlphaNumeric(c)) {
                 _ = self.advance();
@@ -290,7 +296,7 @@ pub const Lexer = struct {
         };
     }
 
-    fn tokenizeNumber(self: *Lexer, start: usize, start_column: usize) !Token {
+    fn tokenizeNumber(self: *Lexer, start: usize, start_column: u32) !Token {
         while (self.peek()) |c| {
             if (self.isDigit(c)) {
                 _ = self.advance();
@@ -323,7 +329,7 @@ pub const Lexer = struct {
         };
     }
 
-    fn tokenizeString(self: *Lexer, start: usize, start_column: usize) !Token {
+    fn tokenizeString(self: *Lexer, start: usize, start_column: u32) !Token {
         const quote = self.advance().?; // Consume opening quote
 
         // Check for triple quotes
@@ -370,7 +376,7 @@ pub const Lexer = struct {
         };
     }
 
-    fn tokenizeOperatorOrDelimiter(self: *Lexer, start: usize, start_column: usize, paren_depth: *usize) !?Token {
+    fn tokenizeOperatorOrDelimiter(self: *Lexer, start: usize, start_column: u32, paren_depth: *usize) !?Token {
         const c = self.advance() orelse return null;
 
         const token_type: TokenType = switch (c) {
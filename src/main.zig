@@ -6,12 +6,16 @@ const compiler = @import("compiler.zig");
 const native_types = @import("analysis/native_types.zig");
 const native_codegen = @import("codegen/native/main.zig");
 
+/// Decided once from argv - compileFile branches on the tag, not string compares
+const Mode = enum { run, build };
+
 const CompileOptions = struct {
     input_file: []const u8,
     output_file: ?[]const u8 = null,
-    mode: []const u8, // "run" or "build"
+    mode: Mode,
     binary: bool = false, // --binary flag
     force: bool = false, // --force/-f flag
+    quiet: bool = false, // Skip per-phase progress (parallel directory builds)
 };
 
 pub fn main() !void {
@@ -30,7 +34,7 @@ pub fn main() !void {
 
     var opts = CompileOptions{
         .input_file = undefined,
-        .mode = "run",
+        .mode = .run,
     };
 
     var i: usize = 1;
@@ -39,7 +43,7 @@ pub fn main() !void {
     // Parse command (build/test or direct file)
     if (std.mem.eql(u8, args[1], "build")) {
         is_build_command = true;
-        opts.mode = "build";
+        opts.mode = .build;
         i = 2;
     } else if (std.mem.eql(u8, args[1], "test")) {
         // Run pytest for now (bridge to Python)
@@ -112,17 +116,24 @@ pub fn main() !void {
     try compileFile(allocator, opts);
 }
 
+/// Upper bound on concurrent zig compiler processes in `pyaot build <dir>`
+const max_parallel_builds = 4;
+
 /// Build all .py files in a directory
 fn buildDirectory(allocator: std.mem.Allocator, dir_path: []const u8, opts: CompileOptions) !void {
     var dir = try std.fs.cwd().openDir(dir_path, .{ .iterate = true });
     defer dir.close();
 
-    var iter = dir.iterate();
-    var file_count: usize = 0;
-    var error_count: usize = 0;
-
-    std.debug.print("Building all .py files in {s}/\n\n", .{dir_path});
+    // Collect paths up front so files can be compiled concurrently
+    var paths = std.ArrayList([]const u8){};
+    defer {
+        for (paths.items) |path| {
+            allocator.free(path);
+        }
+        paths.deinit(allocator);
+    }
 
+    var iter = dir.iterate();
     while (try iter.next()) |entry| {
         if (entry.kind != .file) continue;
 
@@ -131,27 +142,64 @@ fn buildDirectory(allocator: std.mem.Allocator, dir_path: []const u8, opts: Comp
 
         // Build full path
         const full_path = try std.fs.path.join(allocator, &[_][]const u8{ dir_path, entry.name });
-        defer allocator.free(full_path);
-
-        file_count += 1;
-        std.debug.print("=== Building {s} ===\n", .{entry.name});
-
-        var file_opts = opts;
-        file_opts.input_file = full_path;
+        errdefer allocator.free(full_path);
+        try paths.append(allocator, full_path);
+    }
 
-        compileFile(allocator, file_opts) catch |err| {
-            std.debug.print("✗ Failed: {s} - {any}\n\n", .{ entry.name, err });
-            error_count += 1;
-            continue;
-        };
+    std.debug.print("Building all .py files in {s}/\n\n", .{dir_path});
 
-        std.debug.print("\n", .{});
+    var error_count = std.atomic.Value(usize).init(0);
+
+    if (opts.mode == .build) {
+        // Nothing is executed in build mode, so zig build-exe runs can overlap instead
+        // of serializing on compiler startup. Each zig process is itself multi-threaded
+        // and memory-heavy, so only a few run at once.
+        var pool: std.Thread.Pool = undefined;
+        const cpu_count = std.Thread.getCpuCount() catch 1;
+        try pool.init(.{ .allocator = allocator, .n_jobs = @min(cpu_count, max_parallel_builds) });
+        defer pool.deinit();
+
+        // Interleaved phase prints can't be attributed to a file - keep only
+        // the labeled per-file result lines
+        var parallel_opts = opts;
+        parallel_opts.quiet = true;
+
+        var wg: std.Thread.WaitGroup = .{};
+        for (paths.items) |path| {
+            pool.spawnWg(&wg, buildOne, .{ allocator, path, parallel_opts, &error_count });
+        }
+        pool.waitAndWork(&wg);
+    } else {
+        // Run mode executes each program - keep output in file order
+        for (paths.items) |path| {
+            buildOne(allocator, path, opts, &error_count);
+        }
     }
 
+    const file_count = paths.items.len;
+    const failed = error_count.load(.monotonic);
+
     std.debug.print("=== Summary ===\n", .{});
     std.debug.print("Total files: {d}\n", .{file_count});
-    std.debug.print("Success: {d}\n", .{file_count - error_count});
-    std.debug.print("Failed: {d}\n", .{error_count});
+    std.debug.print("Success: {d}\n", .{file_count - failed});
+    std.debug.print("Failed: {d}\n", .{failed});
+}
+
+/// Compile one file of a directory build, counting failures instead of aborting
+fn buildOne(allocator: std.mem.Allocator, path: []const u8, opts: CompileOptions, error_count: *std.atomic.Value(usize)) void {
+    const name = std.fs.path.basename(path);
+    if (!opts.quiet) std.debug.print("=== Building {s} ===\n", .{name});
+
+    var file_opts = opts;
+    file_opts.input_file = path;
+
+    compileFile(allocator, file_opts) catch |err| {
+        std.debug.print("✗ Failed: {s} - {any}\n\n", .{ name, err });
+        _ = error_count.fetchAdd(1, .monotonic);
+        return;
+    };
+
+    if (!opts.quiet) std.debug.print("\n", .{});
 }
 
 /// Get current architecture string (e.g., "x86_64", "arm64")
@@ -167,9 +215,9 @@ fn getArch() []const u8 {
 }
 
 fn compileFile(allocator: std.mem.Allocator, opts: CompileOptions) !void {
-    // Read source file
-    const source = try std.fs.cwd().readFileAlloc(allocator, opts.input_file, 10 * 1024 * 1024); // 10MB max
-    defer allocator.free(source);
+    // Taken before the stat: any later edit gets an mtime at or after this
+    const checked_at = std.time.nanoTimestamp();
+    const source_stat = try std.fs.cwd().statFile(opts.input_file);
 
     // Determine output path
     const bin_path_allocated = opts.output_file == null;
@@ -197,29 +245,26 @@ fn compileFile(allocator: std.mem.Allocator, opts: CompileOptions) !void {
     };
     defer if (bin_path_allocated) allocator.free(bin_path);
 
+    // Fast path: source size/mtime match the last build - skip reading and hashing it
+    if (!opts.force and try cacheStampMatches(allocator, source_stat, bin_path)) {
+        return useCachedOutput(allocator, opts, bin_path);
+    }
+
+    // Read source file
+    const source = try std.fs.cwd().readFileAlloc(allocator, opts.input_file, 10 * 1024 * 1024); // 10MB max
+    defer allocator.free(source);
+
     // Check if binary is up-to-date using content hash (unless --force)
     const should_compile = opts.force or try shouldRecompile(allocator, source, bin_path);
 
     if (!should_compile) {
-        // Output is up-to-date, skip compilation
-        if (std.mem.eql(u8, opts.mode, "run")) {
-            std.debug.print("\n", .{});
-            if (opts.binary) {
-                // Run binary directly
-                var child = std.process.Child.init(&[_][]const u8{bin_path}, allocator);
-                _ = try child.spawnAndWait();
-            } else {
-                // Load and run shared library
-                try runSharedLib(allocator, bin_path);
-            }
-        } else {
-            std.debug.print("✓ Output up-to-date: {s}\n", .{bin_path});
-        }
-        return;
+        // Content unchanged but stat differs (e.g. touched) - refresh the stamp
+        try updateCache(allocator, source, source_stat, checked_at, bin_path);
+        return useCachedOutput(allocator, opts, bin_path);
     }
 
     // PHASE 1: Lexer - Tokenize source code
-    std.debug.print("Lexing...\n", .{});
+    progress(opts, "Lexing...\n");
     var lex = try lexer.Lexer.init(allocator, source);
     defer lex.deinit();
 
@@ -227,26 +272,26 @@ fn compileFile(allocator: std.mem.Allocator, opts: CompileOptions) !void {
     defer allocator.free(tokens);
 
     // PHASE 2: Parser - Build AST
-    std.debug.print("Parsing...\n", .{});
-    var p = parser.Parser.init(allocator, tokens);
+    progress(opts, "Parsing...\n");
+    var p = parser.Parser.init(allocator, tokens, opts.input_file);
     var tree = try p.parse();
     defer tree.deinit(allocator);
 
     // Ensure tree is a module
     if (tree != .module) {
-        std.debug.print("Error: Expected module, got {s}\n", .{@tagName(tree)});
+        std.debug.print("Error: {s}: expected module, got {s}\n", .{ opts.input_file, @tagName(tree) });
         return error.InvalidAST;
     }
 
     // PHASE 3: Type Inference - Infer native Zig types
-    std.debug.print("Inferring types...\n", .{});
+    progress(opts, "Inferring types...\n");
     var type_inferrer = try native_types.TypeInferrer.init(allocator);
     defer type_inferrer.deinit();
 
     try type_inferrer.analyze(tree.module);
 
     // PHASE 4: Native Codegen - Generate native Zig code (no PyObject overhead)
-    std.debug.print("Generating native Zig code...\n", .{});
+    progress(opts, "Generating native Zig code...\n");
     var native_gen = try native_codegen.NativeCodegen.init(allocator, &type_inferrer);
     defer native_gen.deinit();
 
@@ -254,16 +299,16 @@ fn compileFile(allocator: std.mem.Allocator, opts: CompileOptions) !void {
     defer allocator.free(zig_code);
 
     // Native codegen always produces binaries (not shared libraries)
-    std.debug.print("Compiling to native binary...\n", .{});
+    progress(opts, "Compiling to native binary...\n");
     try compiler.compileZig(allocator, zig_code, bin_path);
 
     std.debug.print("✓ Compiled successfully to: {s}\n", .{bin_path});
 
     // Update cache with new hash
-    try updateCache(allocator, source, bin_path);
+    try updateCache(allocator, source, source_stat, checked_at, bin_path);
 
     // Run if mode is "run"
-    if (std.mem.eql(u8, opts.mode, "run")) {
+    if (opts.mode == .run) {
         std.debug.print("\n", .{});
         // Native codegen always produces binaries
         var child = std.process.Child.init(&[_][]const u8{bin_path}, allocator);
@@ -271,6 +316,28 @@ fn compileFile(allocator: std.mem.Allocator, opts: CompileOptions) !void {
     }
 }
 
+/// Print an unlabeled phase message, unless other files are compiling concurrently
+fn progress(opts: CompileOptions, comptime msg: []const u8) void {
+    if (!opts.quiet) std.debug.print(msg, .{});
+}
+
+/// Output is up-to-date, skip compilation - run it or report it
+fn useCachedOutput(allocator: std.mem.Allocator, opts: CompileOptions, bin_path: []const u8) !void {
+    if (opts.mode == .run) {
+        std.debug.print("\n", .{});
+        if (opts.binary) {
+            // Run binary directly
+            var child = std.process.Child.init(&[_][]const u8{bin_path}, allocator);
+            _ = try child.spawnAndWait();
+        } else {
+            // Load and run shared library
+            try runSharedLib(allocator, bin_path);
+        }
+    } else {
+        std.debug.print("✓ Output up-to-date: {s}\n", .{bin_path});
+    }
+}
+
 /// Load and execute a shared library (.so/.dylib)
 fn runSharedLib(allocator: std.mem.Allocator, lib_path: []const u8) !void {
     // Get absolute path for dlopen (need null-terminated string)
@@ -365,8 +432,8 @@ fn shouldRecompile(allocator: std.mem.Allocator, source: []const u8, bin_path: [
     };
     defer allocator.free(cached_hash_hex);
 
-    // Convert hex string back to bytes
-    if (cached_hash_hex.len != 64) return true; // Invalid cache
+    // Convert hex string back to bytes (first 64 chars; a stat stamp may follow)
+    if (cached_hash_hex.len < 64) return true; // Invalid cache
 
     var cached_hash: [32]u8 = undefined;
     for (0..32) |i| {
@@ -377,8 +444,43 @@ fn shouldRecompile(allocator: std.mem.Allocator, source: []const u8, bin_path: [
     return !std.mem.eql(u8, &current_hash, &cached_hash);
 }
 
-/// Update cache with new source hash
-fn updateCache(allocator: std.mem.Allocator, source: []const u8, bin_path: []const u8) !void {
+/// Format the source stat stamp stored after the hash: "<mtime_ns> <size>"
+fn formatStamp(buf: []u8, stat: std.fs.File.Stat) ![]const u8 {
+    return std.fmt.bufPrint(buf, "{d} {d}", .{ stat.mtime, stat.size });
+}
+
+/// Coarsest mtime granularity we trust (FAT and some network filesystems use 2s)
+const stamp_resolution_ns = 2 * std.time.ns_per_s;
+
+/// Check if the cache stamp matches the source's current mtime and size
+/// A match means the source is unchanged, without reading or hashing it
+fn cacheStampMatches(allocator: std.mem.Allocator, stat: std.fs.File.Stat, bin_path: []const u8) !bool {
+    std.fs.cwd().access(bin_path, .{}) catch return false; // Binary missing
+
+    const cache_path = try getCachePath(allocator, bin_path);
+    defer allocator.free(cache_path);
+
+    const cached = std.fs.cwd().readFileAlloc(allocator, cache_path, 1024) catch return false;
+    defer allocator.free(cached);
+
+    // Layout: 64 hex chars, newline, stamp, space, check time (older caches have no stamp)
+    if (cached.len <= 65 or cached[64] != '\n') return false;
+    const rest = cached[65..];
+    const sep = std.mem.lastIndexOfScalar(u8, rest, ' ') orelse return false;
+    const checked_at = std.fmt.parseInt(i128, rest[sep + 1 ..], 10) catch return false;
+
+    // Racily clean (as in git): a source modified within one timestamp tick of the
+    // check could be rewritten at the same size without its mtime moving - only
+    // trust stamps that were already older than that when the hash was taken
+    if (stat.mtime >= checked_at - stamp_resolution_ns) return false;
+
+    var stamp_buf: [96]u8 = undefined;
+    const stamp = try formatStamp(&stamp_buf, stat);
+    return std.mem.eql(u8, rest[0..sep], stamp);
+}
+
+/// Update cache with new source hash, stat stamp and the time the stat was taken
+fn updateCache(allocator: std.mem.Allocator, source: []const u8, stat: std.fs.File.Stat, checked_at: i128, bin_path: []const u8) !void {
     const hash = computeHash(source);
 
     // Convert hash to hex string (manually)
@@ -397,4 +499,11 @@ fn updateCache(allocator: std.mem.Allocator, source: []const u8, bin_path: []con
     defer file.close();
 
     try file.writeAll(&hex_buf);
+
+    var stamp_buf: [96]u8 = undefined;
+    try file.writeAll("\n");
+    try file.writeAll(try formatStamp(&stamp_buf, stat));
+
+    var checked_buf: [48]u8 = undefined;
+    try file.writeAll(try std.fmt.bufPrint(&checked_buf, " {d}", .{checked_at}));
 }
@@ -19,12 +19,14 @@ pub const Parser = struct {
     tokens: []const lexer.Token,
     current: usize,
     allocator: std.mem.Allocator,
+    file_path: []const u8, // Prefixes diagnostics - several files may parse concurrently
 
-    pub fn init(allocator: std.mem.Allocator, tokens: []const lexer.Token) Parser {
+    pub fn init(allocator: std.mem.Allocator, tokens: []const lexer.Token, file_path: []const u8) Parser {
         return Parser{
             .tokens = tokens,
             .current = 0,
             .allocator = allocator,
+            .file_path = file_path,
         };
     }
 
@@ -70,7 +72,8 @@ pub const Parser = struct {
     pub fn expect(self: *Parser, token_type: lexer.TokenType) !lexer.Token {
         const tok = self.peek() orelse return error.UnexpectedEof;
         if (tok.type != token_type) {
-            std.debug.print("Expected {s}, got {s} at line {d}:{d}\n", .{
+            std.debug.print("{s}: Expected {s}, got {s} at line {d}:{d}\n", .{
+                self.file_path,
                 @tagName(token_type),
                 @tagName(tok.type),
                 tok.line,
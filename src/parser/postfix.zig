@@ -328,7 +328,8 @@ pub fn parsePrimary(self: *Parser) ParseError!ast.Node {
                 };
             },
             else => {
-                std.debug.print("Unexpected token in primary: {s} at line {d}:{d}\n", .{
+                std.debug.print("{s}: Unexpected token in primary: {s} at line {d}:{d}\n", .{
+                    self.file_path,
                     @tagName(tok.type),
                     tok.line,
                     tok.column,